@@ -104,8 +104,8 @@ def _course_team_user(request, course_key, email):
         return permissions_error_response
 
     try:
-        user = User.objects.get(email=email)
-    except Exception:  # pylint: disable=broad-except
+        user = User.objects.only('id', 'username', 'email', 'is_active').get(email=email)
+    except User.DoesNotExist:
         msg = {
             "error": _("Could not find user by email address '{email}'.").format(email=email),
         }
@@ -1966,18 +1966,15 @@ def add_stats_for_users_with_null_values(course_stats, users_in_course):
     """
     Update users stats for users with no discussion stats available in course
     """
-    users_returned_from_api = [user['username'] for user in course_stats]
-    user_list = users_in_course.split(',')
-    users_with_no_discussion_content = set(user_list) ^ set(users_returned_from_api)
-    updated_course_stats = course_stats
-    for user in users_with_no_discussion_content:
-        updated_course_stats.append({
-            'username': user,
+    stats_by_username = {stats['username']: stats for stats in course_stats}
+    return [
+        stats_by_username.get(username, {
+            'username': username,
             'threads': None,
             'replies': None,
             'responses': None,
             'active_flags': None,
             'inactive_flags': None,
         })
-    updated_course_stats = sorted(updated_course_stats, key=lambda d: len(d['username']))
-    return updated_course_stats
+        for username in users_in_course.split(',')
+    ]
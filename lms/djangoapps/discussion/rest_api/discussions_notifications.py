@@ -4,6 +4,7 @@ Discussion notifications sender util.
 import logging
 
 from django.conf import settings
+from django.utils.functional import cached_property
 from lms.djangoapps.discussion.django_comment_client.permissions import get_team
 from openedx_events.learning.data import UserNotificationData, CourseNotificationData
 from openedx_events.learning.signals import USER_NOTIFICATION_REQUESTED, COURSE_NOTIFICATION_REQUESTED
@@ -20,10 +21,31 @@ from openedx.core.djangoapps.django_comment_common.models import (
     FORUM_ROLE_MODERATOR,
     CourseDiscussionSettings,
 )
+from openedx.core.lib.cache_utils import request_cached
 
 
 log = logging.getLogger(__name__)
 
+# Maximum number of recipients per emitted notification event, so a single
+# thread on a large course does not fan out one huge payload.
+USER_IDS_CHUNK_SIZE = 500
+
+
+@request_cached()
+def _get_course_discussion_settings(course_key_str):
+    """
+    Returns the discussion settings for a course, cached for the duration of the request.
+    """
+    return CourseDiscussionSettings.objects.get(course_id=course_key_str)
+
+
+@request_cached()
+def _get_course_cohort_settings(course_key_str):
+    """
+    Returns the cohort settings for a course, cached for the duration of the request.
+    """
+    return CourseCohortsSettings.objects.get(course_id=course_key_str)
+
 
 class DiscussionNotificationSender:
     """
@@ -38,6 +60,49 @@ class DiscussionNotificationSender:
         self.parent_response = None
         self._get_parent_response()
 
+    @cached_property
+    def _course_key_str(self):
+        """
+        String course key, computed once per send.
+        """
+        return str(self.course.id)
+
+    @cached_property
+    def _thread_user_id(self):
+        """
+        Id of the thread author as an int.
+        """
+        return int(self.thread.user_id)
+
+    @cached_property
+    def _parent_response_user_id(self):
+        """
+        Id of the parent response author as an int, or None without a parent response.
+        """
+        return int(self.parent_response.attributes['user_id']) if self.parent_response else None
+
+    @cached_property
+    def _group_id(self):
+        """
+        Cohort group id assigned to the thread, if any.
+        """
+        group_id = self.thread.attributes['group_id']
+        return int(group_id) if group_id is not None else None
+
+    @cached_property
+    def _topic_id(self):
+        """
+        Id of the topic (commentable) the thread belongs to.
+        """
+        return self.thread.attributes['commentable_id']
+
+    @cached_property
+    def _thread_type(self):
+        """
+        Type of the thread, either "discussion" or "question".
+        """
+        return self.thread.attributes['thread_type']
+
     def _send_notification(self, user_ids, notification_type, extra_context=None):
         """
         Send notification to users
@@ -48,21 +113,24 @@ class DiscussionNotificationSender:
         if extra_context is None:
             extra_context = {}
 
-        notification_data = UserNotificationData(
-            user_ids=[int(user_id) for user_id in user_ids],
-            context={
-                "replier_name": self.creator.username,
-                "post_title": self.thread.title,
-                "course_name": self.course.display_name,
-                "sender_id": self.creator.id,
-                **extra_context,
-            },
-            notification_type=notification_type,
-            content_url=f"{settings.DISCUSSIONS_MICROFRONTEND_URL}/{str(self.course.id)}/posts/{self.thread.id}",
-            app_name="discussion",
-            course_key=self.course.id,
-        )
-        USER_NOTIFICATION_REQUESTED.send_event(notification_data=notification_data)
+        user_ids = [int(user_id) for user_id in user_ids]
+        context = {
+            "replier_name": self.creator.username,
+            "post_title": self.thread.title,
+            "course_name": self.course.display_name,
+            "sender_id": self.creator.id,
+            **extra_context,
+        }
+        for offset in range(0, len(user_ids), USER_IDS_CHUNK_SIZE):
+            notification_data = UserNotificationData(
+                user_ids=user_ids[offset:offset + USER_IDS_CHUNK_SIZE],
+                context=context,
+                notification_type=notification_type,
+                content_url=f"{settings.DISCUSSIONS_MICROFRONTEND_URL}/{self._course_key_str}/posts/{self.thread.id}",
+                app_name="discussion",
+                course_key=self.course.id,
+            )
+            USER_NOTIFICATION_REQUESTED.send_event(notification_data=notification_data)
 
     def _send_course_wide_notification(self, notification_type, audience_filters=None, extra_context=None):
         """
@@ -81,7 +149,7 @@ class DiscussionNotificationSender:
                 **extra_context,
             },
             notification_type=notification_type,
-            content_url=f"{settings.DISCUSSIONS_MICROFRONTEND_URL}/{str(self.course.id)}/posts/{self.thread.id}",
+            content_url=f"{settings.DISCUSSIONS_MICROFRONTEND_URL}/{self._course_key_str}/posts/{self.thread.id}",
             app_name="discussion",
             audience_filters=audience_filters,
         )
@@ -101,17 +169,17 @@ class DiscussionNotificationSender:
         Send notification to users who are subscribed to the main thread/post i.e.
         there is a response to the main thread.
         """
-        if not self.parent_id and self.creator.id != int(self.thread.user_id):
+        if not self.parent_id and self.creator.id != self._thread_user_id:
             self._send_notification([self.thread.user_id], "new_response")
 
     def _response_and_thread_has_same_creator(self) -> bool:
         """
         Check if response and main thread have same author.
         """
-        return int(self.parent_response.user_id) == int(self.thread.user_id)
+        return self._parent_response_user_id == self._thread_user_id
 
     def _response_and_comment_has_same_creator(self):
-        return int(self.parent_response.attributes['user_id']) == self.creator.id
+        return self._parent_response_user_id == self.creator.id
 
     def send_new_comment_notification(self):
         """
@@ -119,7 +187,7 @@ class DiscussionNotificationSender:
         """
         if (
             self.parent_response and
-            self.creator.id != int(self.thread.user_id)
+            self.creator.id != self._thread_user_id
         ):
             # use your if author of response is same as author of post.
             # use 'their' if comment author is also response author.
@@ -146,7 +214,7 @@ class DiscussionNotificationSender:
         """
         if (
             self.parent_response and
-            self.creator.id != int(self.parent_response.user_id) and not
+            self.creator.id != self._parent_response_user_id and not
             self._response_and_thread_has_same_creator()
         ):
             self._send_notification([self.parent_response.user_id], "new_comment_on_response")
@@ -156,11 +224,11 @@ class DiscussionNotificationSender:
         Check if the subscriber is not the thread creator or response creator
         """
         is_not_creator = (
-            subscriber_id != int(self.thread.user_id) and
+            subscriber_id != self._thread_user_id and
             subscriber_id != int(self.creator.id)
         )
         if self.parent_response:
-            return is_not_creator and subscriber_id != int(self.parent_response.user_id)
+            return is_not_creator and subscriber_id != self._parent_response_user_id
 
         return is_not_creator
 
@@ -170,7 +238,8 @@ class DiscussionNotificationSender:
         except:
         Tread creator , response creator,
         """
-        users = []
+        # Collect into a set so duplicate subscribers are dropped in O(1)
+        users = set()
         page = 1
         has_more_subscribers = True
 
@@ -183,12 +252,11 @@ class DiscussionNotificationSender:
                     subscriber_id = int(subscriber.get('subscriber_id'))
                     # do not send notification to the user who created the response and the thread
                     if self._check_if_subscriber_is_not_thread_or_content_creator(subscriber_id):
-                        users.append(subscriber_id)
+                        users.add(subscriber_id)
             else:
                 has_more_subscribers = False
             page += 1
-        # Remove duplicate users from the list of users to send notification
-        users = list(set(users))
+        users = list(users)
         if not self.parent_id:
             self._send_notification(users, "response_on_followed_post")
         else:
@@ -202,32 +270,32 @@ class DiscussionNotificationSender:
         """
         Creates audience filter based on user cohort and role
         """
-        course_key_str = str(self.course.id)
-        discussion_cohorted = is_discussion_cohorted(course_key_str)
+        course_key_str = self._course_key_str
+        topic_id = self._topic_id
+
+        # Team object from topic id; a team-scoped thread needs none of the
+        # cohort-division lookups below.
+        team = get_team(topic_id)
+        if team:
+            return {
+                'teams': [team.team_id],
+            }
 
         # Retrieves cohort divided discussion
-        discussion_settings = CourseDiscussionSettings.objects.get(course_id=course_key_str)
+        discussion_settings = _get_course_discussion_settings(course_key_str)
+        discussion_cohorted = is_discussion_cohorted(course_key_str, discussion_settings)
         divided_course_wide_discussions, divided_inline_discussions = get_divided_discussions(
             self.course,
             discussion_settings
         )
 
         # Checks if post has any cohort assigned
-        group_id = self.thread.attributes['group_id']
-        if group_id is not None:
-            group_id = int(group_id)
+        group_id = self._group_id
 
         # Course wide topics
         all_topics = divided_inline_discussions + divided_course_wide_discussions
-        topic_id = self.thread.attributes['commentable_id']
         topic_divided = topic_id in all_topics or discussion_settings.always_divide_inline_discussions
 
-        # Team object from topic id
-        team = get_team(topic_id)
-        if team:
-            return {
-                'teams': [team.team_id],
-            }
         if discussion_cohorted and topic_divided and group_id is not None:
             return {
                 'cohorts': [group_id],
@@ -238,7 +306,7 @@ class DiscussionNotificationSender:
         """
         Send notification based on notification_type
         """
-        thread_type = self.thread.attributes['thread_type']
+        thread_type = self._thread_type
         notification_type = (
             "new_question_post"
             if thread_type == "question"
@@ -267,10 +335,11 @@ class DiscussionNotificationSender:
         self._send_course_wide_notification(notification_type, audience_filters, context)
 
 
-def is_discussion_cohorted(course_key_str):
+def is_discussion_cohorted(course_key_str, discussion_settings=None):
     """
     Returns if the discussion is divided by cohorts
     """
-    cohort_settings = CourseCohortsSettings.objects.get(course_id=course_key_str)
-    discussion_settings = CourseDiscussionSettings.objects.get(course_id=course_key_str)
+    cohort_settings = _get_course_cohort_settings(course_key_str)
+    if discussion_settings is None:
+        discussion_settings = _get_course_discussion_settings(course_key_str)
     return cohort_settings.is_cohorted and discussion_settings.always_divide_inline_discussions
@@ -222,6 +222,23 @@ class TestBlackoutDates(ForumsEnableMixin, CommentsServiceMockMixin, ModuleStore
         posting_allowed = self._check_posting_allowed(restriction)
         self.assertEqual(state, posting_allowed)
 
+    def test_posting_with_overlapping_blackouts(self):
+        """
+        Test posting during an active blackout window that overlaps another,
+        already-finished window.
+        Assertion:
+            Posting should not be allowed.
+        """
+        now = datetime.now(UTC)
+        date_ranges = [
+            (now - timedelta(days=14), now + timedelta(days=23)),
+            (now - timedelta(days=10), now - timedelta(days=7)),
+        ]
+        self._set_discussion_blackouts(date_ranges)
+
+        posting_allowed = self._check_posting_allowed(PostingRestriction.SCHEDULED)
+        self.assertFalse(posting_allowed)
+
     def test_posting_scheduled_future(self):
         """
         Test posting when the posting restriction is scheduled in the future.
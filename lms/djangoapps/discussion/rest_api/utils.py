@@ -1,6 +1,7 @@
 """
 Utils for discussion API.
 """
+import math
 from datetime import datetime
 from typing import Dict, List
 
@@ -9,6 +10,7 @@ from django.core.paginator import Paginator
 from django.db.models.functions import Length
 from pytz import UTC
 
+from common.djangoapps.student.models import CourseAccessRole
 from common.djangoapps.student.roles import CourseInstructorRole, CourseStaffRole
 from lms.djangoapps.discussion.django_comment_client.utils import has_discussion_privileges
 from openedx.core.djangoapps.discussions.models import DiscussionsConfiguration, PostingRestriction
@@ -19,15 +21,22 @@ from openedx.core.djangoapps.django_comment_common.models import (
     FORUM_ROLE_MODERATOR,
     Role
 )
+from openedx.core.lib.cache_utils import request_cached
 
 
 class AttributeDict(dict):
     """
-    Converts Dict Keys into Attributes
+    Exposes dict keys as read-only attributes
     """
     __getattr__ = dict.__getitem__
-    __setattr__ = dict.__setitem__
-    __delattr__ = dict.__delitem__
+
+
+@request_cached()
+def _get_discussions_configuration(course_key):
+    """
+    Returns the discussions configuration for a course, cached for the duration of the request.
+    """
+    return DiscussionsConfiguration.get(course_key)
 
 
 def discussion_open_for_user(course, user):
@@ -38,7 +47,7 @@ def discussion_open_for_user(course, user):
             course: Course to check discussions for
             user: User to check for privileges in course
     """
-    discussions_posting_restrictions = DiscussionsConfiguration.get(course.id).posting_restrictions
+    discussions_posting_restrictions = _get_discussions_configuration(course.id).posting_restrictions
     blackout_dates = course.get_discussion_blackout_datetimes()
     return (
         is_posting_allowed(discussions_posting_restrictions, blackout_dates) or
@@ -77,13 +86,14 @@ def get_usernames_from_search_string(course_id, search_string, page_number, page
     """
     matched_users_in_course = User.objects.filter(
         courseenrollment__course_id=course_id,
-        username__icontains=search_string).order_by(Length('username').asc()).values_list('username', flat=True)
-    if not matched_users_in_course:
+        username__icontains=search_string,
+    ).order_by(Length('username').asc(), 'username').values_list('username', flat=True)
+    matched_users_count = matched_users_in_course.count()
+    if not matched_users_count:
         return '', 0, 0
-    matched_users_count = len(matched_users_in_course)
     paginator = Paginator(matched_users_in_course, page_size)
     page_matched_users = paginator.page(page_number)
-    matched_users_pages = int(matched_users_count / page_size)
+    matched_users_pages = math.ceil(matched_users_count / page_size)
     return ','.join(page_matched_users), matched_users_count, matched_users_pages
 
 
@@ -102,13 +112,13 @@ def get_usernames_for_course(course_id, page_number, page_size):
             matched_users_pages (int): pages of matched users in course
     """
     matched_users_in_course = User.objects.filter(courseenrollment__course_id=course_id, ) \
-        .order_by(Length('username').asc()).values_list('username', flat=True)
-    if not matched_users_in_course:
+        .order_by(Length('username').asc(), 'username').values_list('username', flat=True)
+    matched_users_count = matched_users_in_course.count()
+    if not matched_users_count:
         return '', 0, 0
-    matched_users_count = len(matched_users_in_course)
     paginator = Paginator(matched_users_in_course, page_size)
     page_matched_users = paginator.page(page_number)
-    matched_users_pages = int(matched_users_count / page_size)
+    matched_users_pages = math.ceil(matched_users_count / page_size)
     return ','.join(page_matched_users), matched_users_count, matched_users_pages
 
 
@@ -116,80 +126,67 @@ def add_stats_for_users_with_no_discussion_content(course_stats, users_in_course
     """
     Update users stats for users with no discussion stats available in course
     """
-    users_returned_from_api = [user['username'] for user in course_stats]
-    user_list = users_in_course.split(',')
-    users_with_no_discussion_content = set(user_list) ^ set(users_returned_from_api)
-    updated_course_stats = course_stats
-    for user in users_with_no_discussion_content:
-        updated_course_stats.append({
-            'username': user,
+    stats_by_username = {stats['username']: stats for stats in course_stats}
+    return [
+        stats_by_username.get(username, {
+            'username': username,
             'threads': 0,
             'replies': 0,
             'responses': 0,
             'active_flags': 0,
             'inactive_flags': 0,
         })
-    updated_course_stats = sorted(updated_course_stats, key=lambda d: len(d['username']))
-    return updated_course_stats
+        for username in users_in_course.split(',')
+    ]
 
 
+@request_cached()
 def get_course_staff_users_list(course_id):
     """
     Gets user ids for Staff roles for course discussions.
     Roles Course Instructor and Course Staff.
-    """
-    # TODO: cache course_staff_user_ids if we need to improve perf
-    course_staff_user_ids = []
-    staff = list(CourseStaffRole(course_id).users_with_role().values_list('id', flat=True))
-    admins = list(CourseInstructorRole(course_id).users_with_role().values_list('id', flat=True))
-    course_staff_user_ids.extend(staff)
-    course_staff_user_ids.extend(admins)
-    return list(set(course_staff_user_ids))
+    Cached for the duration of the request.
+    """
+    return list(
+        CourseAccessRole.objects.filter(
+            course_id=course_id,
+            org=course_id.org,
+            role__in=[CourseStaffRole.ROLE, CourseInstructorRole.ROLE],
+        ).values_list('user_id', flat=True).distinct()
+    )
 
 
+@request_cached()
 def get_course_ta_users_list(course_id):
     """
     Gets user ids for TA roles for course discussions.
     Roles include Community TA and Group Community TA.
+    Cached for the duration of the request.
     """
-    # TODO: cache ta_users_ids if we need to improve perf
-    ta_users_ids = [
-        user.id
-        for role in Role.objects.filter(name__in=[FORUM_ROLE_GROUP_MODERATOR,
-                                                  FORUM_ROLE_COMMUNITY_TA], course_id=course_id)
-        for user in role.users.all()
-    ]
-    return ta_users_ids
+    return list(
+        Role.objects.filter(
+            name__in=[FORUM_ROLE_GROUP_MODERATOR, FORUM_ROLE_COMMUNITY_TA],
+            course_id=course_id,
+        ).exclude(users__id__isnull=True).values_list('users__id', flat=True).distinct()
+    )
 
 
+@request_cached()
 def get_moderator_users_list(course_id):
     """
     Gets user ids for Moderator roles for course discussions.
     Roles include Discussion Administrator and Discussion Moderator.
+    Cached for the duration of the request.
     """
-    # TODO: cache moderator_user_ids if we need to improve perf
-    moderator_user_ids = [
-        user.id
-        for role in Role.objects.filter(
+    return list(
+        Role.objects.filter(
             name__in=[FORUM_ROLE_ADMINISTRATOR, FORUM_ROLE_MODERATOR],
-            course_id=course_id
-        )
-        for user in role.users.all()
-    ]
-    return moderator_user_ids
-
-
-def filter_topic_from_discussion_id(discussion_id, topics_list):
-    """
-    Returns topic based on discussion id
-    """
-    for topic in topics_list:
-        if topic.get("id") == discussion_id:
-            return topic
-    return {}
+            course_id=course_id,
+        ).exclude(users__id__isnull=True).values_list('users__id', flat=True).distinct()
+    )
 
 
-def create_discussion_children_from_ids(children_ids, blocks, topics):
+def create_discussion_children_from_ids(children_ids, blocks, topics_by_id):
     """
     Takes ids of discussion and return discussion dictionary
     """
@@ -198,7 +195,7 @@ def create_discussion_children_from_ids(children_ids, blocks, topics):
         topic = blocks.get(child_id)
         if topic.get('type') == 'vertical':
             discussions_id = topic.get('discussions_id')
-            topic = filter_topic_from_discussion_id(discussions_id, topics)
+            topic = topics_by_id.get(discussions_id, {})
         if topic:
             discussions.append(topic)
     return discussions
@@ -241,15 +238,10 @@ def add_thread_stats_to_subsection(topics_list):
     """
     for section in topics_list:
         for subsection in section.get('children', []):
-            discussions = 0
-            questions = 0
-            for unit in subsection.get('children', []):
-                thread_counts = unit.get('thread_counts', {})
-                discussions += thread_counts.get('discussion', 0)
-                questions += thread_counts.get('question', 0)
+            unit_counts = [unit.get('thread_counts') or {} for unit in subsection.get('children', ())]
             subsection['thread_counts'] = {
-                'discussion': discussions,
-                'question': questions,
+                'discussion': sum(counts.get('discussion', 0) for counts in unit_counts),
+                'question': sum(counts.get('question', 0) for counts in unit_counts),
             }
 
 
@@ -257,6 +249,7 @@ def create_topics_v3_structure(blocks, topics):
     """
     Create V3 topics structure from blocks and v2 topics
     """
+    topics_by_id = {topic['id']: topic for topic in topics}
     non_courseware_topics = [
         dict({**topic, 'courseware': False})
         for topic in topics
@@ -270,25 +263,31 @@ def create_topics_v3_structure(blocks, topics):
             value['children'] = create_discussion_children_from_ids(
                 value.get('children', []),
                 blocks,
-                topics,
+                topics_by_id,
             )
             subsections = value.get('children')
             for subsection in subsections:
                 subsection['children'] = create_discussion_children_from_ids(
                     subsection.get('children', []),
                     blocks,
-                    topics,
+                    topics_by_id,
                 )
 
     add_thread_stats_to_subsection(courseware_topics)
     structured_topics = non_courseware_topics + courseware_topics
-    topic_ids = get_topic_ids_from_topics(topics)
 
     # Remove all topic ids that are contained in the structured topics
-    for chapter in structured_topics:
-        for sequential in chapter.get('children', []):
-            for item in sequential['children']:
-                topic_ids.remove(item['id'])
+    used_topic_ids = {
+        item['id']
+        for chapter in structured_topics
+        for sequential in chapter.get('children', [])
+        for item in sequential['children']
+    }
+    topic_ids = [
+        topic_id
+        for topic_id in get_topic_ids_from_topics(topics)
+        if topic_id not in used_topic_ids
+    ]
 
     archived_topics = {
         'id': "archived",
@@ -312,18 +311,22 @@ def remove_empty_sequentials(data):
     Returns:
     list: The modified list with empty sequentials removed.
     """
-    new_data = []
-    for obj in data:
-        block_type = obj.get('type')
-        if block_type != 'sequential' or (block_type == 'sequential' and obj.get('children')):
+    child_lists = [data]
+    stack = [data]
+    while stack:
+        children = stack.pop()
+        for obj in children:
             if obj.get('children'):
-                obj['children'] = remove_empty_sequentials(obj['children'])
-                if obj['children'] or block_type != 'chapter':
-                    new_data.append(obj)
-            else:
-                if block_type != 'chapter':
-                    new_data.append(obj)
-    return new_data
+                stack.append(obj['children'])
+                child_lists.append(obj['children'])
+    # Filter the deepest lists first so every parent sees its already-pruned
+    # children; the lists are mutated in place instead of rebuilt per level.
+    for children in reversed(child_lists):
+        children[:] = [
+            obj for obj in children
+            if obj.get('children') or obj.get('type') not in ('sequential', 'chapter')
+        ]
+    return data
 
 
 def get_topic_ids_from_topics(topics: List[Dict[str, str]]) -> List[str]:
@@ -353,12 +356,12 @@ def get_archived_topics(filtered_topic_ids: List[str], topics: List[Dict[str, st
     Returns:
     - A list of archived topic dictionaries, with the same format as the input topics.
     """
-    archived_topics = []
-    for topic_id in filtered_topic_ids:
-        for topic in topics:
-            if topic['id'] == topic_id and topic['usage_key'] is not None:
-                archived_topics.append(topic)
-    return archived_topics
+    topics_by_id = {topic['id']: topic for topic in topics}
+    return [
+        topics_by_id[topic_id]
+        for topic_id in filtered_topic_ids
+        if topics_by_id.get(topic_id, {}).get('usage_key') is not None
+    ]
 
 
 def is_posting_allowed(posting_restrictions: str, blackout_schedules: List):
@@ -372,10 +375,12 @@ def is_posting_allowed(posting_restrictions: str, blackout_schedules: List):
     Returns:
         bool: True if posting is allowed, False otherwise.
     """
-    now = datetime.now(UTC)
     if posting_restrictions == PostingRestriction.DISABLED:
         return True
     elif posting_restrictions == PostingRestriction.SCHEDULED:
+        # The windows are instructor-entered and may overlap or be unordered,
+        # so every one of them has to be checked.
+        now = datetime.now(UTC)
         return not any(schedule["start"] <= now <= schedule["end"] for schedule in blackout_schedules)
     else:
         return False
@@ -8,8 +8,7 @@ from abc import abstractmethod
 from opaque_keys.edx.keys import CourseKey
 
 from common.djangoapps.course_modes.models import CourseMode
-from common.djangoapps.student.models import CourseEnrollment
-from common.djangoapps.student.roles import CourseStaffRole, CourseInstructorRole
+from common.djangoapps.student.models import CourseAccessRole, CourseEnrollment
 from lms.djangoapps.discussion.django_comment_client.utils import get_users_with_roles
 from lms.djangoapps.teams.models import CourseTeam
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -20,11 +19,27 @@ from openedx.core.djangoapps.django_comment_common.models import (
     FORUM_ROLE_COMMUNITY_TA,
     FORUM_ROLE_STUDENT,
 )
+from openedx.core.lib.cache_utils import request_cached
 
 
 log = logging.getLogger(__name__)
 
 
+@request_cached()
+def _course_role_user_ids(course_key, course_roles):
+    """
+    Returns ids of users holding any of the given course roles, memoized for
+    the duration of the request.
+    """
+    return list(
+        CourseAccessRole.objects.filter(
+            course_id=course_key,
+            org=course_key.org,
+            role__in=course_roles,
+        ).values_list('user_id', flat=True).distinct()
+    )
+
+
 class NotificationAudienceFilterBase:
     """
     Base class for notification audience filters
@@ -76,22 +91,12 @@ class CourseRoleAudienceFilter(NotificationAudienceFilterBase):
         if not self.is_valid_filter(course_roles):
             raise ValueError(f'Invalid roles {course_roles} passed to CourseRoleAudienceFilter')
 
-        user_ids = []
-
         course_key = self.course_key
         if not isinstance(course_key, CourseKey):
             course_key = CourseKey.from_string(course_key)
 
-        if 'staff' in course_roles:
-            staff_users = CourseStaffRole(course_key).users_with_role().values_list('id', flat=True)
-            log.info(f'Temp: Course wide notification, staff users calculated are {staff_users}')
-            user_ids.extend(staff_users)
-
-        if 'instructor' in course_roles:
-            instructor_users = CourseInstructorRole(course_key).users_with_role().values_list('id', flat=True)
-            log.info(f'Temp: Course wide notification, instructor users calculated are {instructor_users}')
-            user_ids.extend(instructor_users)
-
+        user_ids = _course_role_user_ids(course_key, tuple(sorted(course_roles)))
+        log.info(f'Temp: Course wide notification, course role users calculated are {user_ids}')
         return user_ids
 
 
@@ -83,10 +83,12 @@ def calculate_course_wide_notification_audience(course_key, audience_filters):
     Calculate the audience for a course-wide notification based on the audience filters
     """
     if not audience_filters:
+        # Stream the ids so the queryset result cache does not hold a second
+        # copy of the whole enrollment list on large courses.
         active_enrollments = CourseEnrollment.objects.filter(
             course_id=course_key,
             is_active=True
-        ).values_list('user_id', flat=True)
+        ).values_list('user_id', flat=True).iterator(chunk_size=10000)
         return list(active_enrollments)
 
     audience_user_ids = []